@@ -1,38 +1,37 @@
 import tkinter as tk
+from tkinter import ttk
 from tkcode import CodeEditor
-import traceback
-import re
-import io
+import ast
+import functools
+import queue
 import sys
-import threading
-import time
 
 # --- Expanded Error Explanations ---
 ERROR_EXPLANATIONS = {
-    "SyntaxError": "🧠 This usually happens due to missing colons, wrong indentation, or incorrect syntax.",
-    "IndentationError": "🔧 Check your indentation. Python is sensitive to spaces and tabs!",
-    "NameError": "🔍 You're using a variable or function that hasn't been defined yet.",
-    "TypeError": "🛠 You're using a function or operator on the wrong data type.",
-    "ZeroDivisionError": "⚠ You tried to divide by zero – which is undefined.",
-    "IndexError": "📦 You're trying to access an index that doesn't exist in a list or string.",
-    "ValueError": "❗ You're passing a value to a function that is of the correct type but inappropriate.",
-    "AttributeError": "🔑 You're trying to access an attribute or method that doesn't exist for that object.",
-    "KeyError": "🗝 You're trying to access a dictionary key that doesn't exist.",
-    "ImportError": "📦 Python can't find the module you're trying to import.",
-    "ModuleNotFoundError": "📦 Python can't find the module you're trying to import.",
-    "FileNotFoundError": "📁 The file you're trying to access does not exist.",
-    "OSError": "💾 An operating system error occurred (file, directory, permissions, etc).",
-    "RuntimeError": "🏃‍♂️ An error that doesn't fall into other categories. Check your logic.",
-    "RecursionError": "🔁 Your function called itself too many times (infinite recursion?).",
-    "MemoryError": "💾 Your code tried to use more memory than is available.",
-    "OverflowError": "🔢 A number is too large to be represented.",
-    "StopIteration": "🛑 An iterator has no more items.",
-    "AssertionError": "❗ An assert statement failed.",
-    "PermissionError": "🚫 You don't have permission to perform this action.",
-    "EOFError": "📚 End Of File reached unexpectedly (e.g., input() got no data).",
-    "FloatingPointError": "⚠ A floating point calculation failed.",
-    "NotImplementedError": "🚧 This feature isn't implemented yet.",
-    "SystemExit": "🚪 The code tried to exit Python.",
+    SyntaxError: "🧠 This usually happens due to missing colons, wrong indentation, or incorrect syntax.",
+    IndentationError: "🔧 Check your indentation. Python is sensitive to spaces and tabs!",
+    NameError: "🔍 You're using a variable or function that hasn't been defined yet.",
+    TypeError: "🛠 You're using a function or operator on the wrong data type.",
+    ZeroDivisionError: "⚠ You tried to divide by zero – which is undefined.",
+    IndexError: "📦 You're trying to access an index that doesn't exist in a list or string.",
+    ValueError: "❗ You're passing a value to a function that is of the correct type but inappropriate.",
+    AttributeError: "🔑 You're trying to access an attribute or method that doesn't exist for that object.",
+    KeyError: "🗝 You're trying to access a dictionary key that doesn't exist.",
+    ImportError: "📦 Python can't find the module you're trying to import.",
+    ModuleNotFoundError: "📦 Python can't find the module you're trying to import.",
+    FileNotFoundError: "📁 The file you're trying to access does not exist.",
+    OSError: "💾 An operating system error occurred (file, directory, permissions, etc).",
+    RuntimeError: "🏃‍♂️ An error that doesn't fall into other categories. Check your logic.",
+    RecursionError: "🔁 Your function called itself too many times (infinite recursion?).",
+    MemoryError: "💾 Your code tried to use more memory than is available.",
+    OverflowError: "🔢 A number is too large to be represented.",
+    StopIteration: "🛑 An iterator has no more items.",
+    AssertionError: "❗ An assert statement failed.",
+    PermissionError: "🚫 You don't have permission to perform this action.",
+    EOFError: "📚 End Of File reached unexpectedly (e.g., input() got no data).",
+    FloatingPointError: "⚠ A floating point calculation failed.",
+    NotImplementedError: "🚧 This feature isn't implemented yet.",
+    SystemExit: "🚪 The code tried to exit Python.",
 }
 
 # --- Constants ---
@@ -52,84 +51,253 @@ ERROR_TEXT_COLOR = "#ef4444"
 SUCCESS_TEXT_COLOR = "#22c55e"
 
 code_placeholder = "# Write your Python code here...\n# Example:\n# print('Hello World')"
+_PLACEHOLDER_STRIPPED = code_placeholder.strip()
+
+_EXEC_GLOBALS = {"__builtins__": __builtins__}
+
+_result_q = queue.Queue()
+_jobs = queue.Queue()
+_worker_started = False
 
 # --- Functions ---
-def analyze_code_async():
+class ViewportCodeEditor(CodeEditor):
+    """CodeEditor that re-highlights only the visible lines (plus a margin)
+    instead of the whole buffer, so large pastes stay responsive."""
+
+    MARGIN = 100
+
+    def __init__(self, master, **kwargs):
+        self._hl_job = None
+        CodeEditor.__init__(self, master, **kwargs)
+        self.bind("<Configure>", self._schedule_highlight, add=True)
+        self.bind("<MouseWheel>", self._schedule_highlight, add=True)
+        self.bind("<Button-4>", self._schedule_highlight, add=True)
+        self.bind("<Button-5>", self._schedule_highlight, add=True)
+
+    def _schedule_highlight(self, event=None):
+        if self._hl_job is not None:
+            self.after_cancel(self._hl_job)
+        self._hl_job = self.after(50, self._highlight_viewport)
+
+    def _highlight_viewport(self):
+        self._hl_job = None
+        first = max(int(self.index("@0,0").split(".")[0]) - self.MARGIN, 1)
+        last = min(int(self.index(f"@0,{self.winfo_height()}").split(".")[0]) + self.MARGIN,
+                   self.number_of_lines)
+        for tag in self.tag_names(index=None):
+            if tag != "sel":
+                self.tag_remove(tag, f"{first}.0", f"{last}.end")
+        for line in range(first, last + 1):
+            self.highlight_line(line=line)
+
+    def highlight_all(self, *_):
+        """Limits tkcode's full-buffer highlight pass to the viewport"""
+        self._highlight_viewport()
+        self.event_generate("<<AllHighlighted>>")
+
+    def insert(self, index, content):
+        """Bulk-inserts multi-line content without tkcode's per-line
+        highlighting; a single debounced viewport pass runs afterwards"""
+        if len(content.splitlines()) > 1:
+            tk.Text.insert(self, index, content)
+            self.see("insert")
+            self._schedule_highlight()
+            return "break"
+        return CodeEditor.insert(self, index, content)
+
+class _ListOut:
+    __slots__ = ("buf",)
+
+    def __init__(self):
+        self.buf = []
+
+    def write(self, s):
+        self.buf.append(s)
+
+    def flush(self):
+        pass
+
+@functools.lru_cache(maxsize=32)
+def _compile_user(src):
+    return compile(src, "<string>", "exec")
+
+@functools.lru_cache(maxsize=32)
+def _compile_user_jit(src, rerun=False):
+    tree = ast.parse(src)
+    if rerun:
+        # The namespace already holds the njit dispatchers from the first
+        # run; re-execute only the non-def statements so they aren't
+        # rebuilt (and numba doesn't recompile from scratch).
+        tree.body = [n for n in tree.body if not isinstance(n, ast.FunctionDef)]
+    else:
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef):
+                node.decorator_list.insert(0, ast.Name(id="njit", ctx=ast.Load()))
+        ast.fix_missing_locations(tree)
+    return compile(tree, "<string>", "exec")
+
+_jit_ns_cache = {}
+
+def _exec_jit(code):
+    """Run the code with top-level functions wrapped in numba.njit.
+    Returns False (so the caller falls back to plain exec) if numba is
+    not installed or can't type the user's code. The executed namespace
+    is cached per source text so dispatchers — and the machine code they
+    compiled — survive re-clicks on the same buffer."""
+    try:
+        import numba
+    except ImportError:
+        return False
+    ns = _jit_ns_cache.get(code)
+    if ns is None:
+        ns = {"__builtins__": __builtins__, "njit": numba.njit}
+        try:
+            import numpy
+            ns["np"] = numpy
+        except ImportError:
+            pass
+        code_obj = _compile_user_jit(code)
+    else:
+        code_obj = _compile_user_jit(code, rerun=True)
+    try:
+        exec(code_obj, ns)
+    except numba.errors.TypingError:
+        return False
+    _jit_ns_cache[code] = ns
+    return True
+
+def _set_busy():
     spinner_label.config(text="⏳ Analyzing...", fg="#facc15")
     run_button.config(state="disabled")
-    window.update_idletasks()
-    time.sleep(0.2)
-    analyze_code()
+
+def _set_idle():
     spinner_label.config(text="")
     run_button.config(state="normal")
 
-def analyze_code():
-    code = code_input.get("1.0", tk.END)
-    output_display.config(state=tk.NORMAL)
-    output_display.delete("1.0", tk.END)
+def analyze_code_async(code, use_jit=False):
+    window.after(0, _set_busy)
+    analyze_code(code, use_jit)
+    window.after(0, _set_idle)
 
-    if not code.strip() or code.strip() == code_placeholder.strip():
-        output_display.insert(tk.END, "⚠ Please enter valid Python code to analyze.\n")
-        output_display.tag_add("error", "1.0", "end")
-        output_display.config(state=tk.DISABLED)
+def _explain(e):
+    return next(
+        (ERROR_EXPLANATIONS[c] for c in type(e).__mro__ if c in ERROR_EXPLANATIONS),
+        "😕 This error type is currently not explained.",
+    )
+
+def analyze_code(code, use_jit=False):
+    if not code.strip() or code.strip() == _PLACEHOLDER_STRIPPED:
+        _result_q.put(("error", "⚠ Please enter valid Python code to analyze.\n"))
         return
 
     try:
-        old_stdout = sys.stdout
-        redirected_output = sys.stdout = io.StringIO()
+        ast.parse(code)
+    except SyntaxError as e:
+        _result_q.put(("error", "".join((
+            f"❌ Error: {type(e).__name__} on line {e.lineno}\n",
+            f"📌 Message: {e.msg}\n",
+            f"💡 Explanation: {_explain(e)}\n",
+        ))))
+        return
+
+    old_stdout = sys.stdout
+    redirected_output = sys.stdout = _ListOut()
+    try:
         local_vars = {}
-        exec(code, {}, local_vars)
-        sys.stdout = old_stdout
-        output_text = redirected_output.getvalue()
+        if not (use_jit and _exec_jit(code)):
+            if use_jit:
+                # A failed JIT attempt may have printed before falling
+                # back; drop the partial capture so output isn't doubled.
+                redirected_output.buf.clear()
+            exec(_compile_user(code), _EXEC_GLOBALS, local_vars)
+        output_text = "".join(redirected_output.buf)
 
         final_output = "✅ Code executed successfully!\n"
         if output_text.strip():
             final_output += f"\n📤 Output:\n{output_text}"
 
-        output_display.insert(tk.END, final_output)
-        output_display.tag_add("success", "1.0", "end")
+        _result_q.put(("success", final_output))
 
     except Exception as e:
-        sys.stdout = old_stdout
         error_type = type(e).__name__
         error_msg = str(e)
-        tb = traceback.format_exc()
 
-        line_info = re.search(r'File "<string>", line (\d+)', tb)
-        line_number = line_info.group(1) if line_info else "?"
+        line_number = "?"
+        frame = e.__traceback__
+        while frame is not None:
+            if frame.tb_frame.f_code.co_filename == "<string>":
+                line_number = frame.tb_lineno
+            frame = frame.tb_next
 
-        explanation = ERROR_EXPLANATIONS.get(error_type, "😕 This error type is currently not explained.")
+        explanation = _explain(e)
 
-        output = f"❌ Error: {error_type} on line {line_number}\n"
-        output += f"📌 Message: {error_msg}\n"
-        output += f"💡 Explanation: {explanation}\n"
+        output = "".join((
+            f"❌ Error: {error_type} on line {line_number}\n",
+            f"📌 Message: {error_msg}\n",
+            f"💡 Explanation: {explanation}\n",
+        ))
 
-        output_display.insert(tk.END, output)
-        output_display.tag_add("error", "1.0", "end")
+        _result_q.put(("error", output))
 
-    output_display.config(state=tk.DISABLED)
+    finally:
+        sys.stdout = old_stdout
+
+def _drain():
+    if not _result_q.empty():
+        output_display.config(state=tk.NORMAL)
+        try:
+            while True:
+                tag, text = _result_q.get_nowait()
+                output_display.delete("1.0", tk.END)
+                output_display.insert(tk.END, text, tag)
+        except queue.Empty:
+            pass
+        output_display.config(state=tk.DISABLED)
+    window.after(20, _drain)
 
 def on_code_focus_in(event):
-    if code_input.get("1.0", tk.END).strip() == code_placeholder:
+    if code_input.get("1.0", tk.END).strip() == _PLACEHOLDER_STRIPPED:
         code_input.delete("1.0", tk.END)
         code_input.config(fg=DARK_TEXT_COLOR)
 
 def on_code_focus_out(event):
-    if not code_input.get("1.0", tk.END).strip():
+    if code_input.compare("end-1c", "==", "1.0"):
         code_input.insert("1.0", code_placeholder)
         code_input.config(fg=PLACEHOLDER_COLOR)
 
 def update_line_numbers(event=None):
-    code_lines = code_input.get("1.0", tk.END).split("\n")
-    line_numbers.config(state=tk.NORMAL)
-    line_numbers.delete("1.0", tk.END)
-    for i in range(1, len(code_lines)):
-        line_numbers.insert(tk.END, f"{i}\n")
-    line_numbers.config(state=tk.DISABLED)
+    line_numbers.delete("all")
+    first = int(code_input.index("@0,0").split(".")[0])
+    last = int(code_input.index(f"@0,{code_input.winfo_height()}").split(".")[0])
+    for i in range(first, last + 1):
+        dline = code_input.dlineinfo(f"{i}.0")
+        if dline:
+            line_numbers.create_text(35, dline[1], text=str(i), anchor="ne",
+                                     fill="#64748b", font=CODE_FONT)
+
+_ln_job = None
+
+def schedule_line_numbers(event=None):
+    global _ln_job
+    if _ln_job is not None:
+        window.after_cancel(_ln_job)
+    _ln_job = window.after(40, _run_line_numbers)
+
+def _run_line_numbers():
+    global _ln_job
+    _ln_job = None
+    update_line_numbers()
 
 def sync_scroll(*args):
     code_input.yview(*args)
-    line_numbers.yview(*args)
+    schedule_line_numbers()
+
+def _yscroll(first, last):
+    code_scrollbar.set(first, last)
+    schedule_line_numbers()
+    # Fires on every view change (wheel, drag, keyboard paging), so the
+    # viewport highlighter can't be scrolled past.
+    code_input._schedule_highlight()
 
 def on_enter(e): run_button['background'] = BUTTON_HOVER_COLOR
 def on_leave(e): run_button['background'] = ACCENT_COLOR
@@ -139,8 +307,30 @@ def clear_output():
     output_display.delete("1.0", tk.END)
     output_display.config(state=tk.DISABLED)
 
+def _worker():
+    while True:
+        code, use_jit = _jobs.get()
+        try:
+            analyze_code_async(code, use_jit)
+        except BaseException as e:
+            # SystemExit and friends escape analyze_code's except Exception;
+            # keep the worker alive and report them like any other error.
+            _result_q.put(("error", "".join((
+                f"❌ Error: {type(e).__name__}\n",
+                f"📌 Message: {e}\n",
+                f"💡 Explanation: {_explain(e)}\n",
+            ))))
+            window.after(0, _set_idle)
+        _jobs.task_done()
+
 def run_code_shortcut(event=None):
-    threading.Thread(target=analyze_code_async).start()
+    global _worker_started
+    if not _worker_started:
+        import threading
+        threading.Thread(target=_worker, daemon=True).start()
+        _worker_started = True
+    if _jobs.qsize() == 0:
+        _jobs.put((code_input.get("1.0", tk.END), jit_var.get()))
     return "break"
 
 def clear_output_shortcut(event=None):
@@ -170,12 +360,14 @@ title_label.grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 15))
 code_outer_frame = tk.Frame(main_frame, bg=FRAME_COLOR, bd=3, relief="ridge")
 code_outer_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", pady=(0, 15))
 
-line_numbers = tk.Text(code_outer_frame, width=4, padx=6, font=CODE_FONT, bg="#0f172a", fg="#64748b",
-                       state=tk.DISABLED, relief=tk.FLAT, wrap=tk.NONE)
+line_numbers = tk.Canvas(code_outer_frame, width=40, bg="#0f172a", highlightthickness=0)
 line_numbers.pack(side=tk.LEFT, fill=tk.Y)
 
+code_scrollbar = ttk.Scrollbar(code_outer_frame, orient="vertical", command=sync_scroll)
+code_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
 # --- Syntax Highlighting Code Editor ---
-code_input = CodeEditor(
+code_input = ViewportCodeEditor(
     code_outer_frame,
     width=90,
     height=20,
@@ -188,15 +380,20 @@ code_input = CodeEditor(
     pady=10,
 )
 code_input.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+# tkcode wires its own vertical scrollbar via yscrollcommand; we replace
+# that with _yscroll for gutter sync, so hide the now-stale internal bar.
+code_input.vertical_scroll.grid_remove()
+code_input.config(yscrollcommand=_yscroll)
 code_input.content = code_placeholder
-code_input.bind("<<TextModified>>", update_line_numbers)
+code_input.bind("<<TextModified>>", schedule_line_numbers)
+code_input.bind("<Configure>", schedule_line_numbers, add=True)
 
 # --- Analyze Button + Spinner + Clear Output ---
 button_frame = tk.Frame(main_frame, bg=BG_COLOR)
 button_frame.grid(row=2, column=0, columnspan=2, sticky="w", pady=(0, 15))
 
 run_button = tk.Button(button_frame, text="🔍 Analyze Code",
-                       command=lambda: threading.Thread(target=analyze_code_async).start(),
+                       command=run_code_shortcut,
                        font=BUTTON_FONT, bg=ACCENT_COLOR, fg="white",
                        activebackground=BUTTON_HOVER_COLOR, activeforeground="white",
                        cursor="hand2", relief=tk.FLAT, padx=16, pady=10, bd=0)
@@ -210,6 +407,13 @@ clear_btn = tk.Button(button_frame, text="🗑️ Clear Output",
                       activeforeground="white", cursor="hand2", relief=tk.FLAT, padx=14, pady=10, bd=0)
 clear_btn.pack(side=tk.LEFT, padx=(15, 0))
 
+jit_var = tk.BooleanVar(value=False)
+jit_check = tk.Checkbutton(button_frame, text="⚡ Numba JIT", variable=jit_var,
+                           font=("Segoe UI", 11), bg=BG_COLOR, fg=DARK_TEXT_COLOR,
+                           selectcolor=FRAME_COLOR, activebackground=BG_COLOR,
+                           activeforeground=DARK_TEXT_COLOR, cursor="hand2")
+jit_check.pack(side=tk.LEFT, padx=(15, 0))
+
 spinner_label = tk.Label(button_frame, text="", font=("Segoe UI", 11, "italic"), bg=BG_COLOR, fg="#facc15")
 spinner_label.pack(side=tk.LEFT, padx=(15, 0))
 
@@ -222,13 +426,14 @@ output_frame.grid(row=4, column=0, columnspan=2, sticky="nsew", pady=(0, 20))
 
 output_display = tk.Text(output_frame, width=90, height=20, font=OUTPUT_FONT,
                         bg=TEXT_BG_COLOR, fg=ERROR_TEXT_COLOR,
-                        relief=tk.FLAT, state=tk.DISABLED, wrap=tk.WORD,
+                        relief=tk.FLAT, wrap=tk.WORD,
                         bd=0, insertbackground=ACCENT_COLOR, spacing3=4)
 output_display.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 output_display.tag_configure("error", foreground=ERROR_TEXT_COLOR)
 output_display.tag_configure("success", foreground=SUCCESS_TEXT_COLOR)
 
-output_display.config(state=tk.NORMAL)
+# Widget is created NORMAL so startup content goes in with a single
+# state flip at the end of setup.
 output_display.insert(tk.END, "🔸 Enter Python code above and click 'Analyze Code' to detect errors and explanations.\n")
 output_display.config(state=tk.DISABLED)
 
@@ -238,5 +443,6 @@ window.bind("<Control-l>", clear_output_shortcut)
 
 # --- Initial Setup ---
 update_line_numbers()
+window.after(20, _drain)
 
 window.mainloop()